@@ -0,0 +1,100 @@
+import asyncio
+import signal
+
+import structlog
+
+try:
+    import uvloop
+except ImportError:  # uvloop does not support Windows
+    uvloop = None
+
+from app.utils.config import config
+from app.utils.logging_config import configure_logging
+from app.services.kafka_service import KafkaService
+from app.services.mongodb_service import MongoDBService
+
+# Configure structured logging
+configure_logging()
+
+logger = structlog.get_logger(__name__)
+
+# Seconds between processing statistics log lines, /api/v1/stats has no access to them
+_STATS_LOG_INTERVAL = 60.0
+
+
+async def _log_stats(kafka_service: KafkaService):
+    """Periodically log the processing statistics of the consumer."""
+    while True:
+        await asyncio.sleep(_STATS_LOG_INTERVAL)
+        stats = kafka_service.get_stats()
+        logger.info("Processing statistics",
+                   total_wallets_processed=stats.total_wallets_processed,
+                   successful_wallets=stats.successful_wallets,
+                   failed_wallets=stats.failed_wallets,
+                   average_processing_time_ms=stats.average_processing_time_ms,
+                   last_processed_wallet=stats.last_processed_wallet,
+                   uptime_seconds=stats.uptime_seconds)
+
+
+async def main():
+    """
+    Run the Kafka consumer as a standalone process.
+    
+    Used with RUN_KAFKA_CONSUMER=false on the API so that the HTTP workers
+    and the scoring consumer do not share an event loop or a CPU.
+    """
+    logger.info("Starting AI Scoring consumer", version=config.VERSION, environment=config.ENVIRONMENT)
+    
+    mongodb_service = None
+    kafka_service = None
+    consumer_task = None
+    stats_task = None
+    
+    try:
+        # Initialize MongoDB service
+        mongodb_service = MongoDBService(config.mongodb_config)
+        await mongodb_service.connect()
+        logger.info("MongoDB service initialized")
+        
+        # Initialize Kafka service
+        kafka_service = KafkaService(config.kafka_config)
+        logger.info("Kafka service initialized")
+        
+        consumer_task = asyncio.create_task(kafka_service.start_consuming())
+        stats_task = asyncio.create_task(_log_stats(kafka_service))
+        
+        # Cancel the consumer on shutdown signals
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, consumer_task.cancel)
+            
+        logger.info("Kafka consumer started")
+        await consumer_task
+        
+    except asyncio.CancelledError:
+        logger.info("Kafka consumer stopped")
+    except Exception as e:
+        logger.error("Kafka consumer failed", error=str(e))
+        raise
+    finally:
+        if stats_task:
+            stats_task.cancel()
+            
+        if consumer_task and not consumer_task.done():
+            consumer_task.cancel()
+            
+        if kafka_service:
+            await kafka_service.shutdown()
+            logger.info("Kafka service shutdown")
+            
+        if mongodb_service:
+            await mongodb_service.close()
+            logger.info("MongoDB service closed")
+
+
+if __name__ == "__main__":
+    # libuv event loop when available, same as uvicorn picks for the API
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -3,36 +3,25 @@ import signal
 import sys
 import time
 from contextlib import asynccontextmanager
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+import orjson
+from pydantic import ValidationError
 import structlog
 import uvicorn
 
 from app.utils.config import config
+from app.utils.logging_config import configure_logging
 from app.services.kafka_service import KafkaService
 from app.services.mongodb_service import MongoDBService
-from app.utils.types import HealthResponse, StatsResponse
+from app.models.dex_model import DEXScoringModel
+from app.utils.types import WalletTransactionInput, format_zscore
 
 # Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
+configure_logging()
 
 logger = structlog.get_logger(__name__)
 
@@ -40,32 +29,87 @@ logger = structlog.get_logger(__name__)
 kafka_service: KafkaService = None
 mongodb_service: MongoDBService = None
 consumer_task: asyncio.Task = None
+health_task: asyncio.Task = None
+
+# Health response, recomposed in the background every _HEALTH_TTL seconds
+_HEALTH_TTL = 1.0  # seconds
+_STATUS_HEALTHY = "healthy"
+_STATUS_UNHEALTHY = "unhealthy"
+_health_response: Optional[Dict[str, Any]] = None
+
+
+async def _unhealthy() -> str:
+    """Status for a service that was never initialized."""
+    return _STATUS_UNHEALTHY
+
+
+async def _compose_health_response() -> Dict[str, Any]:
+    """Check service health and build the health response."""
+    # Probe Kafka and MongoDB concurrently
+    kafka_status, mongodb_status = await asyncio.gather(
+        kafka_service.get_health_status() if kafka_service else _unhealthy(),
+        mongodb_service.get_health_status() if mongodb_service else _unhealthy()
+    )
+    
+    # Overall status
+    healthy = kafka_status == _STATUS_HEALTHY and mongodb_status == _STATUS_HEALTHY
+    
+    return {
+        "status": _STATUS_HEALTHY if healthy else _STATUS_UNHEALTHY,
+        "timestamp": time.time_ns() // 1_000_000_000,
+        "version": config.VERSION,
+        "environment": config.ENVIRONMENT,
+        "kafka_status": kafka_status,
+        "mongodb_status": mongodb_status
+    }
+
+
+async def _health_refresher():
+    """Keep the cached health response fresh so requests never compose it."""
+    global _health_response
+    
+    while True:
+        try:
+            _health_response = await _compose_health_response()
+        except Exception as e:
+            logger.error("Health refresh failed", error=str(e))
+        await asyncio.sleep(_HEALTH_TTL)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown."""
-    global kafka_service, mongodb_service, consumer_task
+    global kafka_service, mongodb_service, consumer_task, health_task
     
     # Startup
     logger.info("Starting AI Scoring Server", version=config.VERSION, environment=config.ENVIRONMENT)
     
     try:
         # Initialize MongoDB service
-        mongodb_service = MongoDBService(config.get_mongodb_config())
+        mongodb_service = MongoDBService(config.mongodb_config)
+        await mongodb_service.connect()
         logger.info("MongoDB service initialized")
         
         # Create database indexes
         await mongodb_service.create_indexes()
         logger.info("Database indexes created")
         
-        # Initialize Kafka service
-        kafka_service = KafkaService(config.get_kafka_config())
+        # Initialize Kafka service (producer only when the consumer runs in its own process)
+        kafka_service = KafkaService(config.kafka_config, consume=config.RUN_KAFKA_CONSUMER)
         logger.info("Kafka service initialized")
         
+        # Shared scoring model for the synchronous API path
+        app.state.scoring_model = DEXScoringModel()
+        
         # Start Kafka consumer in background
-        consumer_task = asyncio.create_task(kafka_service.start_consuming())
-        logger.info("Kafka consumer started")
+        if config.RUN_KAFKA_CONSUMER:
+            consumer_task = asyncio.create_task(kafka_service.start_consuming())
+            logger.info("Kafka consumer started")
+        else:
+            logger.info("Kafka consumer disabled, run it with 'python -m app.consumer'")
+        
+        # Start health refresher in background
+        health_task = asyncio.create_task(_health_refresher())
         
         logger.info("AI Scoring Server started successfully")
         
@@ -79,6 +123,14 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down AI Scoring Server")
     
     try:
+        # Stop health refresher
+        if health_task and not health_task.done():
+            health_task.cancel()
+            try:
+                await health_task
+            except asyncio.CancelledError:
+                pass
+        
         # Stop Kafka consumer
         if consumer_task and not consumer_task.done():
             consumer_task.cancel()
@@ -110,6 +162,7 @@ app = FastAPI(
     description=config.DESCRIPTION,
     version=config.VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if config.is_development() else None,
     redoc_url="/redoc" if config.is_development() else None
 )
@@ -131,82 +184,121 @@ async def root():
     }
 
 
-@app.get("/api/v1/health", response_model=HealthResponse)
+@app.get("/api/v1/health", response_model=None)
 async def health_check():
     """Health check endpoint for monitoring."""
+    # Served from the background refresher; compose inline only before its first run
+    if _health_response is not None:
+        return ORJSONResponse(_health_response)
+    
     try:
-        # Check Kafka health
-        kafka_status = kafka_service.get_health_status() if kafka_service else "unhealthy"
-        
-        # Check MongoDB health
-        mongodb_status = mongodb_service.get_health_status() if mongodb_service else "unhealthy"
-        
-        # Overall status
-        overall_status = "healthy" if kafka_status == "healthy" and mongodb_status == "healthy" else "unhealthy"
-        
-        return HealthResponse(
-            status=overall_status,
-            timestamp=int(time.time()),
-            version=config.VERSION,
-            environment=config.ENVIRONMENT,
-            kafka_status=kafka_status,
-            mongodb_status=mongodb_status
-        )
+        return ORJSONResponse(await _compose_health_response())
         
     except Exception as e:
         logger.error("Health check failed", error=str(e))
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
 
 
-@app.get("/api/v1/stats", response_model=StatsResponse)
+@app.get("/api/v1/stats", response_model=None)
 async def get_stats():
     """Get processing statistics."""
+    if not kafka_service:
+        raise HTTPException(status_code=503, detail="Kafka service not available")
+    if not kafka_service.consume:
+        # Counters live in the consumer process, this one never scores Kafka messages
+        raise HTTPException(status_code=503, detail="Kafka consumer runs out of process, statistics are not available here")
+    
     try:
-        if not kafka_service:
-            raise HTTPException(status_code=503, detail="Kafka service not available")
-        
         stats = kafka_service.get_stats()
         
-        return StatsResponse(
-            total_wallets_processed=stats['total_wallets_processed'],
-            successful_wallets=stats['successful_wallets'],
-            failed_wallets=stats['failed_wallets'],
-            average_processing_time_ms=stats['average_processing_time_ms'],
-            last_processed_wallet=stats['last_processed_wallet'],
-            uptime_seconds=stats['uptime_seconds']
-        )
+        return ORJSONResponse({
+            "total_wallets_processed": stats.total_wallets_processed,
+            "successful_wallets": stats.successful_wallets,
+            "failed_wallets": stats.failed_wallets,
+            "average_processing_time_ms": stats.average_processing_time_ms,
+            "last_processed_wallet": stats.last_processed_wallet,
+            "uptime_seconds": stats.uptime_seconds
+        })
         
     except Exception as e:
         logger.error("Failed to get statistics", error=str(e))
         raise HTTPException(status_code=500, detail=f"Failed to get statistics: {str(e)}")
 
 
-@app.post("/api/v1/process-wallet")
-async def process_wallet_sync(wallet_data: Dict[str, Any], background_tasks: BackgroundTasks):
+def _inline_schema(model) -> Dict[str, Any]:
+    """JSON schema of a model with nested $defs inlined, for embedding in OpenAPI."""
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+    
+    def resolve(node):
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if ref is not None and ref.startswith("#/$defs/"):
+                return resolve(defs[ref[len("#/$defs/"):]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(item) for item in node]
+        return node
+    
+    return resolve(schema)
+
+
+@app.post(
+    "/api/v1/process-wallet",
+    # The body is parsed by hand, so document it for /docs explicitly
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _inline_schema(WalletTransactionInput)}}
+        }
+    }
+)
+async def process_wallet_sync(request: Request, background_tasks: BackgroundTasks):
     """
     Synchronous endpoint to process a single wallet (for testing).
     This endpoint processes the wallet immediately and returns the result.
     """
+    if not kafka_service:
+        raise HTTPException(status_code=503, detail="Kafka service not available")
+    
+    # Parse the raw body once with orjson instead of FastAPI's generic dict body handling,
+    # rejecting bad input with the same 422 shape FastAPI's own body validation uses
     try:
-        if not kafka_service:
-            raise HTTPException(status_code=503, detail="Kafka service not available")
-        
-        # Process wallet using the scoring model directly
-        from app.utils.types import WalletTransactionInput
-        from app.models.dex_model import DEXScoringModel
-        
-        # Validate input
-        wallet_input = WalletTransactionInput(**wallet_data)
-        
-        # Process with AI model
-        scoring_model = DEXScoringModel()
+        wallet_data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise RequestValidationError([{
+            "type": "json_invalid",
+            "loc": ("body", e.pos),
+            "msg": "JSON decode error",
+            "input": {},
+            "ctx": {"error": e.msg}
+        }])
+    if not isinstance(wallet_data, dict):
+        raise RequestValidationError([{
+            "type": "dict_type",
+            "loc": ("body",),
+            "msg": "Input should be a valid dictionary",
+            "input": wallet_data
+        }])
+    
+    # Validate input
+    try:
+        wallet_input = WalletTransactionInput.model_validate(wallet_data)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
+    
+    try:
+        # Process with the shared AI model
+        scoring_model = app.state.scoring_model
         category_scores, overall_score = scoring_model.process_wallet_data(wallet_input.data)
         
         # Create success response
         result = {
             "wallet_address": wallet_input.wallet_address,
-            "zscore": f"{overall_score:.18f}",
-            "timestamp": int(time.time()),
+            "zscore": format_zscore(overall_score),
+            "timestamp": time.time_ns() // 1_000_000_000,
             "categories": [
                 {
                     "category": cat.category,
@@ -225,7 +317,8 @@ async def process_wallet_sync(wallet_data: Dict[str, Any], background_tasks: Bac
             ]
         }
         
-        return JSONResponse(content=result, status_code=200)
+        # Serialize with orjson directly, skipping FastAPI's jsonable_encoder pass
+        return ORJSONResponse(result)
         
     except Exception as e:
         logger.error("Failed to process wallet", error=str(e))
@@ -239,9 +332,9 @@ async def get_config():
         raise HTTPException(status_code=403, detail="Configuration endpoint disabled in production")
     
     return {
-        "server": config.get_server_config(),
-        "kafka": config.get_kafka_config(),
-        "mongodb": config.get_mongodb_config(),
+        "server": dict(config.server_config),
+        "kafka": dict(config.kafka_config),
+        "mongodb": dict(config.mongodb_config),
         "performance": {
             "max_workers": config.MAX_WORKERS,
             "batch_size": config.BATCH_SIZE,
@@ -262,12 +355,16 @@ signal.signal(signal.SIGTERM, signal_handler)
 
 
 if __name__ == "__main__":
+    # Single worker when the Kafka consumer runs in-process
+    workers = 1 if config.RUN_KAFKA_CONSUMER else config.MAX_WORKERS
+    
     # Run the application
     uvicorn.run(
         "app.main:app",
         host=config.HOST,
         port=config.PORT,
         log_level=config.LOG_LEVEL.lower(),
-        reload=config.is_development(),
-        workers=1  # Single worker for Kafka consumer
+        # Uvicorn ignores workers when reloading, so only reload a single worker
+        reload=config.is_development() and workers == 1,
+        workers=workers
     ) 
\ No newline at end of file
@@ -1,12 +1,43 @@
-import pandas as pd
+import math
+import time
 import numpy as np
-from typing import Dict, List, Tuple, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Tuple, Optional
 import structlog
-from app.utils.types import Transaction, ProtocolData, CategoryFeatures, CategoryScore
+from app.utils.types import Transaction, ProtocolData, CategoryFeatures, CategoryScore, DEX_PROTOCOL_TYPE
 
 logger = structlog.get_logger(__name__)
 
+SECONDS_PER_DAY = 86400
+
+# Action codes used to bucket transactions during feature extraction
+_DEPOSIT, _SWAP, _WITHDRAW, _OTHER = 0, 1, 2, 3
+_NUM_ACTION_CODES = 4
+
+# Feature columns holding counts rather than amounts
+_COUNT_FEATURES = frozenset({'num_deposits', 'num_swaps', 'unique_pools', 'num_withdraws'})
+
+_ACTION_CODES = {
+    'deposit': _DEPOSIT,
+    'add_liquidity': _DEPOSIT,
+    'swap': _SWAP,
+    'withdraw': _WITHDRAW,
+    'remove_liquidity': _WITHDRAW
+}
+
+
+class DEXFeatureArrays(NamedTuple):
+    """Columnar DEX features with one row per scored transaction list."""
+    total_deposit_usd: np.ndarray
+    total_swap_volume: np.ndarray
+    num_deposits: np.ndarray
+    num_swaps: np.ndarray
+    avg_hold_time_days: np.ndarray
+    unique_pools: np.ndarray
+    total_withdraw_usd: np.ndarray
+    num_withdraws: np.ndarray
+    avg_transaction_size_usd: np.ndarray
+    transaction_frequency_days: np.ndarray
+
 
 class DEXScoringModel:
     """
@@ -45,6 +76,20 @@ class DEXScoringModel:
             'long': 90,      # 90 days
             'hodl': 365      # 1 year
         }
+        
+        # Score ladders as (thresholds, points) lookup tables
+        self._volume_ladder = self._build_ladder(self.volume_thresholds.values(), [100, 150, 200, 300])
+        self._frequency_ladder = self._build_ladder(self.frequency_thresholds.values(), [50, 100, 150, 200])
+        self._holding_ladder = self._build_ladder(self.holding_time_thresholds.values(), [50, 100, 150, 200])
+        self._diversity_ladder = self._build_ladder([1, 3, 5], [25, 50, 100])
+        self._size_ladder = self._build_ladder([10, 100, 1000], [50, 75, 100])
+        
+        # Sigmoid lookup table over the usual combined score range (max interpolation error ~1e-6)
+        self._sigmoid_x = np.linspace(self.min_score, self.max_score, 16385)
+        self._sigmoid_y = 1000 / (1 + np.exp(-(self._sigmoid_x - 500) / 200))
+        
+        # All features are zero without transactions, so the empty score is a constant
+        self._empty_dex_score = round(self._normalize_score(0.0), 2)
     
     def process_wallet_data(self, wallet_data: List[ProtocolData]) -> Tuple[List[CategoryScore], float]:
         """
@@ -58,37 +103,72 @@ class DEXScoringModel:
         """
         try:
             category_scores = []
-            total_score = 0.0
-            total_weight = 0.0
             
             for protocol_data in wallet_data:
-                if protocol_data.protocolType.lower() == 'dexes':
-                    category_score = self._calculate_dex_score(protocol_data.transactions)
-                    category_scores.append(category_score)
-                    
-                    # Weight the category score (DEX gets full weight for now)
-                    weighted_score = category_score.score * 1.0
-                    total_score += weighted_score
-                    total_weight += 1.0
+                if protocol_data.protocolType == DEX_PROTOCOL_TYPE:
+                    category_scores.append(self._calculate_dex_score(protocol_data.transactions))
                 else:
                     # For other protocol types, create a basic score
-                    category_score = self._calculate_basic_protocol_score(protocol_data)
-                    category_scores.append(category_score)
-                    
-                    # Other protocols get reduced weight
-                    weighted_score = category_score.score * 0.5
-                    total_score += weighted_score
-                    total_weight += 0.5
+                    category_scores.append(self._calculate_basic_protocol_score(protocol_data))
             
-            # Calculate overall weighted score
-            overall_score = total_score / total_weight if total_weight > 0 else 0.0
-            
-            return category_scores, overall_score
+            return category_scores, self._calculate_overall_score(category_scores)
             
         except Exception as e:
             self.logger.error("Error processing wallet data", error=str(e), wallet_data=wallet_data)
             raise
     
+    def process_wallet_batch(self, wallets: List[List[ProtocolData]]) -> List[Tuple[List[CategoryScore], float]]:
+        """
+        Process several wallets at once, scoring all of their DEX categories
+        in a single vectorized pass.
+        
+        Args:
+            wallets: List of wallets, each a list of protocol data
+            
+        Returns:
+            List of (category_scores, overall_score) tuples in input order
+        """
+        try:
+            # Score every DEX transaction list in the batch together
+            dex_segments = [
+                protocol_data.transactions
+                for wallet_data in wallets
+                for protocol_data in wallet_data
+                if protocol_data.protocolType == DEX_PROTOCOL_TYPE
+            ]
+            dex_scores = iter(self._calculate_dex_scores(dex_segments))
+            
+            # Split the results back per wallet
+            results = []
+            for wallet_data in wallets:
+                category_scores = []
+                for protocol_data in wallet_data:
+                    if protocol_data.protocolType == DEX_PROTOCOL_TYPE:
+                        category_scores.append(next(dex_scores))
+                    else:
+                        category_scores.append(self._calculate_basic_protocol_score(protocol_data))
+                
+                results.append((category_scores, self._calculate_overall_score(category_scores)))
+            
+            return results
+            
+        except Exception as e:
+            self.logger.error("Error processing wallet batch", error=str(e), batch_size=len(wallets))
+            raise
+    
+    def _calculate_overall_score(self, category_scores: List[CategoryScore]) -> float:
+        """Combine category scores into the weighted overall wallet score."""
+        total_score = 0.0
+        total_weight = 0.0
+        
+        for category_score in category_scores:
+            # DEX gets full weight for now, other protocols get reduced weight
+            weight = 1.0 if category_score.category == DEX_PROTOCOL_TYPE else 0.5
+            total_score += category_score.score * weight
+            total_weight += weight
+        
+        return total_score / total_weight if total_weight > 0 else 0.0
+    
     def _calculate_dex_score(self, transactions: List[Transaction]) -> CategoryScore:
         """
         Calculate DEX-specific reputation score based on transaction patterns.
@@ -99,103 +179,146 @@ class DEXScoringModel:
         Returns:
             CategoryScore with calculated score and features
         """
+        if not transactions:
+            return self._empty_dex_category()
+        
         try:
-            # Convert transactions to DataFrame for easier processing
-            df = self._transactions_to_dataframe(transactions)
-            
-            # Extract features
-            features = self._extract_dex_features(df)
-            
-            # Calculate LP score (liquidity provision)
-            lp_score = self._calculate_lp_score(features)
-            
-            # Calculate swap score (trading activity)
-            swap_score = self._calculate_swap_score(features)
-            
-            # Combine scores with weights
-            combined_score = (lp_score * self.lp_weight) + (swap_score * self.swap_weight)
-            
-            # Normalize score to 0-1000 range
-            normalized_score = self._normalize_score(combined_score)
-            
-            # Create category score
-            category_score = CategoryScore(
-                category="dexes",
-                score=round(normalized_score, 2),
-                transaction_count=len(transactions),
-                features=features
-            )
-            
-            return category_score
+            return self._calculate_dex_scores([transactions])[0]
             
         except Exception as e:
             self.logger.error("Error calculating DEX score", error=str(e), transactions=transactions)
             raise
     
-    def _transactions_to_dataframe(self, transactions: List[Transaction]) -> pd.DataFrame:
-        """Convert transactions to pandas DataFrame for analysis."""
-        data = []
-        
-        for tx in transactions:
-            row = {
-                'document_id': tx.document_id,
-                'action': tx.action,
-                'timestamp': tx.timestamp,
-                'caller': tx.caller,
-                'protocol': tx.protocol,
-                'poolId': tx.poolId,
-                'poolName': tx.poolName,
-                'token_in_amount': tx.tokenIn.amountUSD if tx.tokenIn else 0,
-                'token_out_amount': tx.tokenOut.amountUSD if tx.tokenOut else 0,
-                'token0_amount': tx.token0.amountUSD if tx.token0 else 0,
-                'token1_amount': tx.token1.amountUSD if tx.token1 else 0,
-                'datetime': datetime.fromtimestamp(tx.timestamp)
-            }
-            data.append(row)
-        
-        df = pd.DataFrame(data)
-        df = df.sort_values('timestamp')
-        return df
+    def _calculate_dex_scores(self, segments: List[List[Transaction]]) -> List[CategoryScore]:
+        """
+        Calculate DEX reputation scores for many transaction lists at once.
+        
+        Args:
+            segments: Transaction lists, one per DEX category to score
+            
+        Returns:
+            CategoryScore for each transaction list in input order
+        """
+        # Only transaction lists with activity go through feature extraction
+        active = [transactions for transactions in segments if transactions]
+        if not active:
+            return [self._empty_dex_category() for _ in segments]
+        
+        # Extract features
+        features = self._extract_dex_features(active)
+        
+        # Calculate LP and swap scores, combined and normalized to 0-1000 range
+        normalized_scores = self._score_dex_features(features).tolist()
+        
+        # Create category scores from feature rows (values are already typed, skip validation)
+        names = DEXFeatureArrays._fields
+        rows = zip(normalized_scores, zip(*(values.tolist() for values in features)))
+        
+        category_scores = []
+        for transactions in segments:
+            if not transactions:
+                category_scores.append(self._empty_dex_category())
+                continue
+            score, row = next(rows)
+            category_scores.append(CategoryScore.model_construct(
+                category=DEX_PROTOCOL_TYPE,
+                score=round(score, 2),
+                transaction_count=len(transactions),
+                features=CategoryFeatures.model_construct(**dict(zip(names, row)))
+            ))
+        
+        return category_scores
+    
+    def _empty_dex_category(self) -> CategoryScore:
+        """CategoryScore for a DEX category without transactions."""
+        return CategoryScore.model_construct(
+            category=DEX_PROTOCOL_TYPE,
+            score=self._empty_dex_score,
+            transaction_count=0,
+            features=CategoryFeatures.model_construct()
+        )
     
-    def _extract_dex_features(self, df: pd.DataFrame) -> CategoryFeatures:
-        """Extract meaningful features from transaction data."""
-        features = CategoryFeatures()
+    def _extract_dex_features(self, segments: List[List[Transaction]]) -> DEXFeatureArrays:
+        """Extract meaningful features from transaction data, one row per transaction list."""
+        num_segments = len(segments)
+        lengths = np.fromiter((len(transactions) for transactions in segments), dtype=np.int64, count=num_segments)
+        features = DEXFeatureArrays(*(
+            np.zeros(num_segments, dtype=np.int64 if name in _COUNT_FEATURES else np.float64)
+            for name in DEXFeatureArrays._fields
+        ))
+        
+        # Walk every transaction once into columnar arrays; a transaction that does not fit
+        # them fails the whole call rather than leaving every row of the batch at defaults
+        n = int(lengths.sum())
+        segment_ids = np.repeat(np.arange(num_segments), lengths)
+        codes = np.empty(n, dtype=np.int8)
+        token0 = np.empty(n, dtype=np.float64)
+        token1 = np.empty(n, dtype=np.float64)
+        token_in = np.empty(n, dtype=np.float64)
+        timestamps = np.empty(n, dtype=np.int64)
+        unique_pools = np.empty(num_segments, dtype=np.int64)
+        
+        i = 0
+        for segment, transactions in enumerate(segments):
+            pool_ids = set()
+            for tx in transactions:
+                codes[i] = _ACTION_CODES.get(tx.action, _OTHER)
+                token0[i] = tx.token0.amountUSD if tx.token0 else 0.0
+                token1[i] = tx.token1.amountUSD if tx.token1 else 0.0
+                token_in[i] = tx.tokenIn.amountUSD if tx.tokenIn else 0.0
+                timestamps[i] = tx.timestamp
+                pool_ids.add(tx.poolId)
+                i += 1
+            unique_pools[segment] = len(pool_ids)
         
         try:
+            # Per-(segment, action) reductions
+            keys = segment_ids * _NUM_ACTION_CODES + codes
+            shape = (num_segments, _NUM_ACTION_CODES)
+            counts = np.bincount(keys, minlength=num_segments * _NUM_ACTION_CODES).reshape(shape)
+            # (bincount returns int64 for empty input even with weights)
+            liquidity = np.bincount(keys, weights=token0 + token1, minlength=num_segments * _NUM_ACTION_CODES).reshape(shape).astype(np.float64, copy=False)
+            swap_volume = np.bincount(keys, weights=token_in, minlength=num_segments * _NUM_ACTION_CODES).reshape(shape).astype(np.float64, copy=False)
+            
             # Basic transaction counts
-            features.num_deposits = len(df[df['action'].isin(['deposit', 'add_liquidity'])])
-            features.num_swaps = len(df[df['action'] == 'swap'])
-            features.num_withdraws = len(df[df['action'].isin(['withdraw', 'remove_liquidity'])])
+            num_deposits = counts[:, _DEPOSIT]
             
             # Volume calculations
-            features.total_deposit_usd = df[df['action'].isin(['deposit', 'add_liquidity'])]['token0_amount'].sum() + \
-                                       df[df['action'].isin(['deposit', 'add_liquidity'])]['token1_amount'].sum()
-            
-            features.total_swap_volume = df[df['action'] == 'swap']['token_in_amount'].sum()
-            features.total_withdraw_usd = df[df['action'].isin(['withdraw', 'remove_liquidity'])]['token0_amount'].sum() + \
-                                        df[df['action'].isin(['withdraw', 'remove_liquidity'])]['token1_amount'].sum()
-            
-            # Unique pools
-            features.unique_pools = df['poolId'].nunique()
+            total_deposit_usd = liquidity[:, _DEPOSIT]
+            total_swap_volume = swap_volume[:, _SWAP]
+            total_withdraw_usd = liquidity[:, _WITHDRAW]
             
             # Average transaction size
-            total_volume = features.total_deposit_usd + features.total_swap_volume + features.total_withdraw_usd
-            total_transactions = len(df)
-            features.avg_transaction_size_usd = total_volume / total_transactions if total_transactions > 0 else 0
+            total_volume = total_deposit_usd + total_swap_volume + total_withdraw_usd
+            avg_transaction_size_usd = np.divide(total_volume, lengths, out=np.zeros(num_segments), where=lengths > 0)
             
             # Holding time calculation (simplified - assumes deposits are held until now)
-            if features.num_deposits > 0:
-                deposit_times = df[df['action'].isin(['deposit', 'add_liquidity'])]['datetime']
-                if len(deposit_times) > 0:
-                    # Calculate average time since deposit
-                    now = datetime.now()
-                    hold_times = [(now - dt).days for dt in deposit_times]
-                    features.avg_hold_time_days = np.mean(hold_times)
-            
-            # Transaction frequency
-            if len(df) > 1:
-                time_span = (df['datetime'].max() - df['datetime'].min()).days
-                features.transaction_frequency_days = time_span / len(df) if time_span > 0 else 0
+            deposit_mask = codes == _DEPOSIT
+            now = time.time_ns() // 1_000_000_000
+            hold_days = (now - timestamps[deposit_mask]) // SECONDS_PER_DAY
+            total_hold_days = np.bincount(segment_ids[deposit_mask], weights=hold_days, minlength=num_segments)
+            avg_hold_time_days = np.divide(total_hold_days, num_deposits, out=np.zeros(num_segments), where=num_deposits > 0)
+            
+            # Transaction frequency over each segment's time span
+            time_span = np.zeros(num_segments, dtype=np.int64)
+            active = lengths > 0
+            if n > 0:
+                starts = (np.cumsum(lengths) - lengths)[active]
+                time_span[active] = (np.maximum.reduceat(timestamps, starts) - np.minimum.reduceat(timestamps, starts)) // SECONDS_PER_DAY
+            transaction_frequency_days = np.divide(time_span, lengths, out=np.zeros(num_segments), where=(lengths > 1) & (time_span > 0))
+            
+            features = DEXFeatureArrays(
+                total_deposit_usd=total_deposit_usd,
+                total_swap_volume=total_swap_volume,
+                num_deposits=num_deposits,
+                num_swaps=counts[:, _SWAP],
+                avg_hold_time_days=avg_hold_time_days,
+                unique_pools=unique_pools,
+                total_withdraw_usd=total_withdraw_usd,
+                num_withdraws=counts[:, _WITHDRAW],
+                avg_transaction_size_usd=avg_transaction_size_usd,
+                transaction_frequency_days=transaction_frequency_days
+            )
             
         except Exception as e:
             self.logger.warning("Error extracting some features", error=str(e))
@@ -203,127 +326,102 @@ class DEXScoringModel:
         
         return features
     
-    def _calculate_lp_score(self, features: CategoryFeatures) -> float:
-        """Calculate liquidity provider score based on LP behavior."""
-        score = 0.0
+    def _score_dex_features(self, features: DEXFeatureArrays) -> np.ndarray:
+        """
+        Calculate LP and swap scores and normalize their weighted sum in one pass.
+        Features scored on the same ladder by both components are looked up together.
         
-        try:
-            # Volume-based scoring
-            if features.total_deposit_usd >= self.volume_thresholds['whale']:
-                score += 300
-            elif features.total_deposit_usd >= self.volume_thresholds['high']:
-                score += 200
-            elif features.total_deposit_usd >= self.volume_thresholds['medium']:
-                score += 150
-            elif features.total_deposit_usd >= self.volume_thresholds['low']:
-                score += 100
-            
-            # Frequency-based scoring
-            if features.num_deposits >= self.frequency_thresholds['very_high']:
-                score += 200
-            elif features.num_deposits >= self.frequency_thresholds['high']:
-                score += 150
-            elif features.num_deposits >= self.frequency_thresholds['medium']:
-                score += 100
-            elif features.num_deposits >= self.frequency_thresholds['low']:
-                score += 50
-            
-            # Holding time scoring
-            if features.avg_hold_time_days >= self.holding_time_thresholds['hodl']:
-                score += 200
-            elif features.avg_hold_time_days >= self.holding_time_thresholds['long']:
-                score += 150
-            elif features.avg_hold_time_days >= self.holding_time_thresholds['medium']:
-                score += 100
-            elif features.avg_hold_time_days >= self.holding_time_thresholds['short']:
-                score += 50
-            
-            # Pool diversity bonus
-            if features.unique_pools >= 5:
-                score += 100
-            elif features.unique_pools >= 3:
-                score += 50
-            elif features.unique_pools >= 1:
-                score += 25
-            
-            # Liquidity retention bonus (deposits > withdrawals)
-            if features.total_deposit_usd > features.total_withdraw_usd:
-                retention_ratio = (features.total_deposit_usd - features.total_withdraw_usd) / features.total_deposit_usd
-                score += retention_ratio * 100
+        Args:
+            features: Columnar DEX features
             
-        except Exception as e:
-            self.logger.warning("Error calculating LP score", error=str(e))
+        Returns:
+            Normalized DEX scores, one per feature row
+        """
+        # Unpack features and ladders into locals once
+        (deposits, swap_volume, num_deposits, num_swaps, hold_days,
+         unique_pools, withdrawals, _, avg_size, _) = features
+        ladder_points = self._ladder_points
         
-        return min(score, 1000)  # Cap at 1000
-    
-    def _calculate_swap_score(self, features: CategoryFeatures) -> float:
-        """Calculate trading score based on swap activity."""
-        score = 0.0
+        # Volume and frequency ladders for deposits and swaps together
+        volume_points = ladder_points(self._volume_ladder, np.stack([deposits, swap_volume]))
+        frequency_points = ladder_points(self._frequency_ladder, np.stack([num_deposits, num_swaps]))
         
-        try:
-            # Volume-based scoring
-            if features.total_swap_volume >= self.volume_thresholds['whale']:
-                score += 300
-            elif features.total_swap_volume >= self.volume_thresholds['high']:
-                score += 200
-            elif features.total_swap_volume >= self.volume_thresholds['medium']:
-                score += 150
-            elif features.total_swap_volume >= self.volume_thresholds['low']:
-                score += 100
-            
-            # Frequency-based scoring
-            if features.num_swaps >= self.frequency_thresholds['very_high']:
-                score += 200
-            elif features.num_swaps >= self.frequency_thresholds['high']:
-                score += 150
-            elif features.num_swaps >= self.frequency_thresholds['medium']:
-                score += 100
-            elif features.num_swaps >= self.frequency_thresholds['low']:
-                score += 50
-            
-            # Transaction size consistency
-            if features.avg_transaction_size_usd > 0:
-                if features.avg_transaction_size_usd >= 1000:
-                    score += 100
-                elif features.avg_transaction_size_usd >= 100:
-                    score += 75
-                elif features.avg_transaction_size_usd >= 10:
-                    score += 50
-            
-            # Pool diversity bonus
-            if features.unique_pools >= 5:
-                score += 100
-            elif features.unique_pools >= 3:
-                score += 50
-            elif features.unique_pools >= 1:
-                score += 25
-            
-        except Exception as e:
-            self.logger.warning("Error calculating swap score", error=str(e))
+        # Pool diversity bonus is shared by both components
+        diversity_points = ladder_points(self._diversity_ladder, unique_pools)
+        
+        # LP score: volume, frequency, holding time and diversity
+        lp_score = volume_points[0] + frequency_points[0] + diversity_points
+        lp_score += ladder_points(self._holding_ladder, hold_days)
         
-        return min(score, 1000)  # Cap at 1000
+        # Liquidity retention bonus (deposits > withdrawals)
+        retained = deposits > withdrawals
+        lp_score[retained] += (deposits[retained] - withdrawals[retained]) / deposits[retained] * 100
+        
+        # Swap score: volume, frequency, transaction size consistency and diversity
+        swap_score = volume_points[1] + frequency_points[1] + diversity_points
+        swap_score += ladder_points(self._size_ladder, avg_size)
+        
+        # Combine capped scores with weights and normalize to 0-1000 range
+        combined_score = (np.minimum(lp_score, 1000) * self.lp_weight) + (np.minimum(swap_score, 1000) * self.swap_weight)
+        return self._normalize_score(combined_score)
+    
+    @staticmethod
+    def _build_ladder(thresholds, points) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Build a lookup table for a monotone score ladder.
+        
+        Reaching thresholds[i] awards points[i]; values below the first
+        threshold award nothing.
+        """
+        return (
+            np.array([-np.inf, *thresholds], dtype=np.float64),
+            np.array([0.0, *points], dtype=np.float64)
+        )
+    
+    @staticmethod
+    def _ladder_points(ladder: Tuple[np.ndarray, np.ndarray], value):
+        """Look up the points awarded on a ladder for a scalar or array of values."""
+        thresholds, points = ladder
+        return points[np.searchsorted(thresholds, value, side='right') - 1]
     
     def _calculate_basic_protocol_score(self, protocol_data: ProtocolData) -> CategoryScore:
         """Calculate basic score for non-DEX protocols."""
-        features = CategoryFeatures()
-        features.transaction_count = len(protocol_data.transactions)
-        features.unique_pools = len(set(tx.poolId for tx in protocol_data.transactions))
+        transactions = protocol_data.transactions
+        transaction_count = len(transactions)
+        features = CategoryFeatures.model_construct()
+        
+        if not transactions:
+            return CategoryScore.model_construct(
+                category=protocol_data.protocolType,
+                score=0.0,
+                transaction_count=0,
+                features=features
+            )
+        features.unique_pools = len({tx.poolId for tx in transactions})
         
         # Basic scoring for other protocols
-        base_score = min(features.transaction_count * 10 + features.unique_pools * 5, 500)
+        base_score = min(transaction_count * 10 + features.unique_pools * 5, 500)
         
-        return CategoryScore(
+        return CategoryScore.model_construct(
             category=protocol_data.protocolType,
-            score=round(base_score, 2),
-            transaction_count=len(protocol_data.transactions),
+            score=float(base_score),
+            transaction_count=transaction_count,
             features=features
         )
     
-    def _normalize_score(self, score: float) -> float:
-        """Normalize score to 0-1000 range."""
+    def _normalize_score(self, score):
+        """Normalize a score or an array of scores to 0-1000 range."""
         # Apply sigmoid-like normalization for better distribution
-        normalized = 1000 / (1 + np.exp(-(score - 500) / 200))
-        return max(0, min(1000, normalized))
+        if np.ndim(score) == 0:
+            return min(max(1000 / (1 + math.exp(-(score - 500) / 200)), 0), 1000)
+        
+        # Arrays interpolate the precomputed table; combined scores are capped at 1000
+        # but go negative with negative amounts, which np.interp would clamp to the edge
+        normalized = np.interp(score, self._sigmoid_x, self._sigmoid_y)
+        outside = (score < self.min_score) | (score > self.max_score)
+        if outside.any():
+            normalized[outside] = 1000 / (1 + np.exp(-(score[outside] - 500) / 200))
+        return normalized
     
     def get_user_tags(self, features: CategoryFeatures, overall_score: float) -> List[str]:
         """Generate user behavior tags based on features and score."""
@@ -1,22 +1,104 @@
-import json
+import orjson
 import time
 import asyncio
-from typing import Optional, Dict, Any
-from kafka import KafkaConsumer, KafkaProducer
-from kafka.errors import KafkaError, KafkaTimeoutError
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Mapping, Tuple, Union
+from confluent_kafka import Consumer, Producer, Message, KafkaError, KafkaException, TopicPartition
 import structlog
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from app.utils.types import (
     WalletTransactionInput, 
-    WalletScoreSuccess, 
     WalletScoreFailure,
-    CategoryError
+    CategoryScore,
+    CategoryError,
+    format_zscore
 )
 from app.models.dex_model import DEXScoringModel
+from app.utils.logging_config import LOG_LEVEL, configure_logging
 
 logger = structlog.get_logger(__name__)
 
+# Scoring model of a worker process, built once by _init_scoring_worker
+_worker_model: Optional[DEXScoringModel] = None
+
+# Outcome of validating and scoring one message in a worker
+_SCORED, _INVALID, _FAILED = 0, 1, 2
+
+# WalletScoreSuccess as a fixed JSON envelope, fields in model order
+_SUCCESS_TEMPLATE = (
+    b'{"wallet_address":%b,"zscore":"%b","timestamp":%d,'
+    b'"processing_time_ms":%d,"categories":%b}'
+)
+_CATEGORY_SCORES = TypeAdapter(List[CategoryScore])
+
+
+@dataclass(slots=True)
+class ProcessingStats:
+    """Wallet processing counters of a KafkaService, updated per published result."""
+    start_time: float
+    total_wallets_processed: int = 0
+    successful_wallets: int = 0
+    failed_wallets: int = 0
+    total_processing_time_ms: int = 0
+    last_processed_wallet: Optional[str] = None
+    # Derived, refreshed by get_stats
+    uptime_seconds: int = 0
+    average_processing_time_ms: float = 0.0
+
+
+def _init_scoring_worker():
+    """Configure logging and build the scoring model in a new worker process."""
+    global _worker_model
+    configure_logging()
+    _worker_model = DEXScoringModel()
+
+
+def _score_wallet_messages(messages: List[bytes]) -> List[Tuple[int, str, Any]]:
+    """
+    Decode, validate and score wallet messages in a scoring worker process.
+    
+    Args:
+        messages: Raw Kafka message values
+        
+    Returns:
+        (outcome, wallet_address, result) per message in input order, where result is
+        (category_scores, overall_score) when scored and the error text otherwise
+    """
+    outcomes = [None] * len(messages)
+    wallets = []
+    
+    # Parse and validate input data
+    for i, message_value in enumerate(messages):
+        try:
+            wallets.append((i, WalletTransactionInput(**orjson.loads(message_value))))
+        except ValidationError as e:
+            outcomes[i] = (_INVALID, "unknown", str(e))
+        except Exception as e:
+            outcomes[i] = (_FAILED, "unknown", str(e))
+    
+    if not wallets:
+        return outcomes
+    
+    # Score all valid wallets in one model call, one call per wallet if that fails
+    try:
+        results = _worker_model.process_wallet_batch([wallet_input.data for _, wallet_input in wallets])
+        for (i, wallet_input), result in zip(wallets, results):
+            outcomes[i] = (_SCORED, wallet_input.wallet_address, result)
+    except Exception:
+        for i, wallet_input in wallets:
+            try:
+                result = _worker_model.process_wallet_data(wallet_input.data)
+                outcomes[i] = (_SCORED, wallet_input.wallet_address, result)
+            except Exception as e:
+                outcomes[i] = (_FAILED, wallet_input.wallet_address, str(e))
+    
+    return outcomes
+
 
 class KafkaService:
     """
@@ -24,10 +106,10 @@ class KafkaService:
     Handles message processing, AI scoring, and result publication.
     """
     
-    def __init__(self, config: Dict[str, str]):
+    def __init__(self, config: Mapping[str, Any], consume: bool = True):
         self.config = config
+        self.consume = consume
         self.logger = logger
-        self.scoring_model = DEXScoringModel()
         
         # Kafka configuration
         self.bootstrap_servers = config.get('KAFKA_BOOTSTRAP_SERVERS', 'localhost:9092')
@@ -35,50 +117,76 @@ class KafkaService:
         self.success_topic = config.get('KAFKA_SUCCESS_TOPIC', 'wallet-scores-success')
         self.failure_topic = config.get('KAFKA_FAILURE_TOPIC', 'wallet-scores-failure')
         self.consumer_group = config.get('KAFKA_CONSUMER_GROUP', 'ai-scoring-service')
+        self.batch_size = int(config.get('BATCH_SIZE', 64))
+        self.poll_timeout = 0.1  # Max seconds to wait for a full batch
+        self.max_workers = int(config.get('MAX_WORKERS', 4))
+        
+        # Scoring runs in worker processes so it neither blocks the event loop nor shares one core
+        self.executor: Optional[ProcessPoolExecutor] = None
+        if consume:
+            self.executor = self._create_executor()
         
         # Kafka clients
-        self.consumer: Optional[KafkaConsumer] = None
-        self.producer: Optional[KafkaProducer] = None
+        self.consumer: Optional[Consumer] = None
+        # librdkafka consumer calls block, so they run on one dedicated thread
+        self._consumer_executor: Optional[ThreadPoolExecutor] = None
+        if consume:
+            self._consumer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='kafka-consumer')
+        self.producer: Optional[Producer] = None
         
         # Statistics
-        self.stats = {
-            'total_wallets_processed': 0,
-            'successful_wallets': 0,
-            'failed_wallets': 0,
-            'total_processing_time_ms': 0,
-            'last_processed_wallet': None,
-            'start_time': time.time()
-        }
+        self.stats = ProcessingStats(start_time=time.time())
         
         # Initialize Kafka clients
         self._init_kafka_clients()
     
+    def _create_executor(self) -> ProcessPoolExecutor:
+        """Create the pool of scoring worker processes."""
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            # Spawn rather than fork, the parent already runs librdkafka threads
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_scoring_worker
+        )
+    
+    def _restart_executor(self):
+        """Replace a scoring pool that lost a worker, which leaves it permanently broken."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = None
+        self.executor = self._create_executor()
+        self.logger.warning("Scoring workers restarted")
+    
     def _init_kafka_clients(self):
-        """Initialize Kafka consumer and producer."""
+        """Initialize Kafka consumer (when consuming) and producer."""
         try:
             # Initialize consumer
-            self.consumer = KafkaConsumer(
-                self.input_topic,
-                bootstrap_servers=self.bootstrap_servers,
-                group_id=self.consumer_group,
-                auto_offset_reset='earliest',
-                enable_auto_commit=True,
-                value_deserializer=lambda m: json.loads(m.decode('utf-8')),
-                consumer_timeout_ms=1000,  # 1 second timeout for non-blocking
-                max_poll_records=10,  # Process up to 10 messages per poll
-                session_timeout_ms=30000,
-                heartbeat_interval_ms=3000
-            )
+            if self.consume:
+                self.consumer = Consumer({
+                    'bootstrap.servers': self.bootstrap_servers,
+                    'group.id': self.consumer_group,
+                    'auto.offset.reset': 'earliest',
+                    'enable.auto.commit': False,  # Offsets are committed once per processed batch
+                    'enable.auto.offset.store': False,  # Only offsets of published results are committed
+                    'on_commit': self._on_commit,
+                    'fetch.min.bytes': 65536,  # Fetch in larger chunks...
+                    'fetch.wait.max.ms': 50,  # ...but never wait long for them
+                    'queued.max.messages.kbytes': 65536,
+                    'session.timeout.ms': 30000,
+                    'heartbeat.interval.ms': 3000
+                })
+                self.consumer.subscribe([self.input_topic])
             
             # Initialize producer
-            self.producer = KafkaProducer(
-                bootstrap_servers=self.bootstrap_servers,
-                value_serializer=lambda v: json.dumps(v, default=str).encode('utf-8'),
-                acks='all',  # Wait for all replicas
-                retries=3,
-                max_in_flight_requests_per_connection=1,
-               # enable_idempotence=True
-            )
+            self.producer = Producer({
+                'bootstrap.servers': self.bootstrap_servers,
+                'acks': 'all',  # Wait for all replicas
+                'retries': 3,
+                'enable.idempotence': True,  # Keeps ordering with pipelined requests
+                'linger.ms': 20,  # Let sends accumulate into batches
+                'batch.num.messages': 10000,
+                'batch.size': 131072,  # Large batches give lz4 meaningful blocks
+                'compression.type': 'lz4'
+            })
             
             self.logger.info("Kafka clients initialized successfully", 
                            bootstrap_servers=self.bootstrap_servers,
@@ -93,30 +201,34 @@ class KafkaService:
         self.logger.info("Starting Kafka consumer", topic=self.input_topic)
         
         try:
+            loop = asyncio.get_running_loop()
             while True:
-                # Poll for messages
-                message_batch = self.consumer.poll(timeout_ms=1000, max_records=10)
+                # Consume up to one batch in the consumer thread, keeping the event loop free
+                messages = await loop.run_in_executor(
+                    self._consumer_executor, self.consumer.consume, self.batch_size, self.poll_timeout
+                )
+                
+                if messages:
+                    # Next offset to commit per (topic, partition), filled as results are queued
+                    stored: Dict[Tuple[str, int], int] = {}
+                    try:
+                        await self._process_batch(messages, stored)
+                    except BrokenProcessPool:
+                        # Workers died again on a fresh pool: stop without committing the batch
+                        raise
+                    except Exception as e:
+                        self.logger.error("Error processing message batch", 
+                                       error=str(e), 
+                                       batch_size=len(messages))
+                        
+                        # Redeliver every message whose result was not queued, so none is dropped
+                        await loop.run_in_executor(self._consumer_executor, self._rewind_batch, messages, stored)
                 
-                for tp, messages in message_batch.items():
-                    for message in messages:
-                        try:
-                            await self._process_message(message)
-                        except Exception as e:
-                            self.logger.error("Error processing message", 
-                                           error=str(e), 
-                                           topic=tp.topic,
-                                           partition=tp.partition,
-                                           offset=message.offset)
-                            
-                            # Publish failure message
-                            await self._publish_failure(
-                                wallet_address="unknown",
-                                error=f"Message processing failed: {str(e)}",
-                                processing_time_ms=0
-                            )
+                    # Acknowledge the whole batch at once
+                    self._commit_batch()
                 
-                # Small delay to prevent busy waiting
-                await asyncio.sleep(0.1)
+                # Serve delivery reports for queued results
+                self.producer.poll(0)
                 
         except KeyboardInterrupt:
             self.logger.info("Received shutdown signal, stopping consumer")
@@ -125,176 +237,240 @@ class KafkaService:
         finally:
             await self.shutdown()
     
-    async def _process_message(self, message):
-        """Process a single Kafka message."""
-        start_time = time.time()
-        wallet_address = "unknown"
+    async def _process_batch(self, messages: List[Message], stored: Dict[Tuple[str, int], int]):
+        """
+        Process a batch of Kafka messages. Raw message values are decoded, validated
+        and scored in the worker processes, one chunk per worker, and every outcome
+        is published individually. The offset after each published message is
+        recorded in stored by (topic, partition).
+        """
+        start_ns = time.monotonic_ns()
+        batch = []
+        
+        for message in messages:
+            if message.error():
+                self.logger.warning("Kafka consumer error", error=str(message.error()))
+                continue
+            batch.append(message)
+        
+        if not batch:
+            return
+        
+        self.logger.info("Processing wallet batch", batch_size=len(batch))
         
+        # Validate and process with AI model across the worker processes
+        values = [message.value() for message in batch]
         try:
-            # Parse message
-            message_data = message.value
-            self.logger.debug("Processing message", message_data=message_data)
-            
-            # Validate input data
-            wallet_input = WalletTransactionInput(**message_data)
-            wallet_address = wallet_input.wallet_address
-            
-            self.logger.info("Processing wallet", wallet_address=wallet_address)
-            
-            # Process with AI model
-            category_scores, overall_score = self.scoring_model.process_wallet_data(wallet_input.data)
-            
-            # Calculate processing time
-            processing_time_ms = int((time.time() - start_time) * 1000)
-            
-            # Create success message
-            success_message = WalletScoreSuccess(
-                wallet_address=wallet_address,
-                zscore=f"{overall_score:.18f}",  # 18 decimal places for precision
-                timestamp=int(time.time()),
-                processing_time_ms=processing_time_ms,
-                categories=category_scores
-            )
-            
-            # Publish success message
-            await self._publish_success(success_message)
-            
-            # Update statistics
-            self._update_stats(True, processing_time_ms, wallet_address)
-            
-            self.logger.info("Successfully processed wallet", 
-                           wallet_address=wallet_address,
-                           score=overall_score,
-                           processing_time_ms=processing_time_ms)
-            
-        except ValidationError as e:
-            processing_time_ms = int((time.time() - start_time) * 1000)
-            error_msg = f"Validation error: {str(e)}"
-            
-            await self._publish_failure(
-                wallet_address=wallet_address,
-                error=error_msg,
-                processing_time_ms=processing_time_ms,
-                categories=self._create_error_categories(message_data)
-            )
-            
-            self._update_stats(False, processing_time_ms, wallet_address)
-            self.logger.error("Validation error", error=error_msg, wallet_address=wallet_address)
-            
-        except Exception as e:
-            processing_time_ms = int((time.time() - start_time) * 1000)
-            error_msg = f"Processing error: {str(e)}"
-            
-            await self._publish_failure(
-                wallet_address=wallet_address,
-                error=error_msg,
-                processing_time_ms=processing_time_ms,
-                categories=self._create_error_categories(message_data if 'message_data' in locals() else {})
-            )
+            chunks = await self._score_values(values)
+        except BrokenProcessPool as e:
+            # Nothing of the batch is published yet, so score it once more on fresh workers
+            self.logger.error("Scoring worker died", error=str(e), batch_size=len(values))
+            self._restart_executor()
+            chunks = await self._score_values(values)
+        
+        # Wallets in a batch are scored together, so stamp them once
+        processing_time_ms = (time.monotonic_ns() - start_ns) // 1_000_000
+        timestamp = time.time_ns() // 1_000_000_000
+        
+        # Publish results
+        outcomes = (outcome for chunk in chunks for outcome in chunk)
+        for message, message_value, (outcome, wallet_address, result) in zip(batch, values, outcomes):
+            if outcome == _SCORED:
+                try:
+                    category_scores, overall_score = result
+                    self._publish_wallet_score(
+                        wallet_address, category_scores, overall_score, processing_time_ms, timestamp
+                    )
+                except Exception as e:
+                    self._handle_processing_error(
+                        wallet_address, e, processing_time_ms, timestamp, self._decode_message_data(message_value)
+                    )
+            elif outcome == _INVALID:
+                self._handle_validation_error(
+                    result, processing_time_ms, timestamp, self._decode_message_data(message_value)
+                )
+            else:
+                self._handle_processing_error(
+                    wallet_address, result, processing_time_ms, timestamp, self._decode_message_data(message_value)
+                )
             
-            self._update_stats(False, processing_time_ms, wallet_address)
-            self.logger.error("Processing error", error=error_msg, wallet_address=wallet_address)
+            # The result is queued, so the next commit may cover this message
+            self.consumer.store_offsets(message=message)
+            stored[message.topic(), message.partition()] = message.offset() + 1
+    
+    async def _score_values(self, values: List[bytes]) -> List[List[Tuple[int, str, Any]]]:
+        """Score raw message values in the worker processes, one chunk per worker."""
+        loop = asyncio.get_running_loop()
+        chunk_size = -(-len(values) // self.max_workers)
+        return await asyncio.gather(*(
+            loop.run_in_executor(self.executor, _score_wallet_messages, values[i:i + chunk_size])
+            for i in range(0, len(values), chunk_size)
+        ))
+    
+    @staticmethod
+    def _decode_message_data(message_value: bytes) -> Any:
+        """Decode a message value again to describe its failure, empty if it is not JSON."""
+        try:
+            return orjson.loads(message_value)
+        except orjson.JSONDecodeError:
+            return {}
+    
+    def _publish_wallet_score(self, wallet_address: str, category_scores: list, 
+                              overall_score: float, processing_time_ms: int, timestamp: int):
+        """Publish a successful wallet score and record it in the statistics."""
+        # Fill the success envelope, only the categories need a full encoder pass
+        payload = _SUCCESS_TEMPLATE % (
+            orjson.dumps(wallet_address),
+            format_zscore(overall_score).encode(),
+            timestamp,
+            processing_time_ms,
+            _CATEGORY_SCORES.dump_json(category_scores)
+        )
+        
+        # Publish success message
+        self._publish_success(payload)
+        
+        # Update statistics
+        self._update_stats(True, processing_time_ms, wallet_address)
+        
+        self.logger.info("Successfully processed wallet", 
+                       wallet_address=wallet_address,
+                       score=overall_score,
+                       processing_time_ms=processing_time_ms)
+    
+    def _handle_validation_error(self, error: str, processing_time_ms: int, timestamp: int, 
+                                 message_data: Dict[str, Any]):
+        """Publish a failure message for a message that is not a valid wallet input."""
+        wallet_address = "unknown"
+        error_msg = f"Validation error: {error}"
+        
+        self._publish_failure(
+            wallet_address=wallet_address,
+            error=error_msg,
+            processing_time_ms=processing_time_ms,
+            categories=self._create_error_categories(message_data),
+            timestamp=timestamp
+        )
+        
+        self._update_stats(False, processing_time_ms, wallet_address)
+        self.logger.error("Validation error", error=error_msg, wallet_address=wallet_address)
+    
+    def _handle_processing_error(self, wallet_address: str, error: Union[Exception, str], 
+                                 processing_time_ms: int, timestamp: int, message_data: Dict[str, Any]):
+        """Publish a failure message for a wallet that could not be processed."""
+        error_msg = f"Processing error: {str(error)}"
+        
+        self._publish_failure(
+            wallet_address=wallet_address,
+            error=error_msg,
+            processing_time_ms=processing_time_ms,
+            categories=self._create_error_categories(message_data),
+            timestamp=timestamp
+        )
+        
+        self._update_stats(False, processing_time_ms, wallet_address)
+        self.logger.error("Processing error", error=error_msg, wallet_address=wallet_address)
     
     def _create_error_categories(self, message_data: Dict[str, Any]) -> list:
         """Create error categories for failure messages."""
         try:
-            categories = []
-            if 'data' in message_data:
-                for protocol_data in message_data['data']:
-                    category_error = CategoryError(
-                        category=protocol_data.get('protocolType', 'unknown'),
-                        error="Failed to process",
-                        transaction_count=len(protocol_data.get('transactions', []))
-                    )
-                    categories.append(category_error)
-            return categories
+            if 'data' not in message_data:
+                return []
+            return [
+                CategoryError(
+                    category=protocol_data.get('protocolType', 'unknown'),
+                    error="Failed to process",
+                    transaction_count=len(protocol_data.get('transactions', ()))
+                )
+                for protocol_data in message_data['data']
+            ]
         except Exception:
             return [CategoryError(category="unknown", error="Failed to process", transaction_count=0)]
     
-    async def _publish_success(self, success_message: WalletScoreSuccess):
-        """Publish success message to Kafka."""
+    def _publish_success(self, payload: bytes):
+        """Queue a serialized success message for Kafka; delivery is reported to _on_delivery."""
         try:
-            future = self.producer.send(
-                self.success_topic,
-                value=success_message.dict()
-            )
-            
-            # Wait for the message to be sent
-            record_metadata = future.get(timeout=10)
-            
-            self.logger.debug("Success message published", 
-                            topic=record_metadata.topic,
-                            partition=record_metadata.partition,
-                            offset=record_metadata.offset)
+            self._produce(self.success_topic, payload)
             
         except Exception as e:
             self.logger.error("Failed to publish success message", error=str(e))
             raise
     
-    async def _publish_failure(self, wallet_address: str, error: str, 
-                              processing_time_ms: int, categories: list = None):
-        """Publish failure message to Kafka."""
+    def _publish_failure(self, wallet_address: str, error: str, 
+                         processing_time_ms: int, categories: list = None, timestamp: Optional[int] = None):
+        """Queue failure message for Kafka; delivery is reported to _on_delivery."""
         try:
             failure_message = WalletScoreFailure(
                 wallet_address=wallet_address,
                 error=error,
-                timestamp=int(time.time()),
+                timestamp=timestamp if timestamp is not None else time.time_ns() // 1_000_000_000,
                 processing_time_ms=processing_time_ms,
                 categories=categories or []
             )
             
-            future = self.producer.send(
-                self.failure_topic,
-                value=failure_message.dict()
-            )
-            
-            # Wait for the message to be sent
-            record_metadata = future.get(timeout=10)
-            
-            self.logger.debug("Failure message published", 
-                            topic=record_metadata.topic,
-                            partition=record_metadata.partition,
-                            offset=record_metadata.offset)
+            self._produce(self.failure_topic, failure_message.model_dump_json())
             
         except Exception as e:
             self.logger.error("Failed to publish failure message", error=str(e))
             raise
     
+    def _produce(self, topic: str, payload: Union[str, bytes]):
+        """Queue a serialized message without waiting for the broker."""
+        try:
+            self.producer.produce(topic, value=payload, callback=self._on_delivery)
+        except BufferError:
+            # Local queue is full, serve delivery reports to make room and retry once
+            self.producer.poll(1)
+            self.producer.produce(topic, value=payload, callback=self._on_delivery)
+    
+    def _on_delivery(self, err, msg):
+        """Delivery report callback, served by producer.poll() and flush()."""
+        if err is not None:
+            self.logger.error("Failed to deliver message", topic=msg.topic(), error=str(err))
+        elif LOG_LEVEL <= logging.DEBUG:
+            self.logger.debug("Message published", 
+                            topic=msg.topic(),
+                            partition=msg.partition(),
+                            offset=msg.offset())
+    
     def _update_stats(self, success: bool, processing_time_ms: int, wallet_address: str):
         """Update processing statistics."""
-        self.stats['total_wallets_processed'] += 1
-        self.stats['total_processing_time_ms'] += processing_time_ms
+        # Only the event loop writes stats: scoring workers return outcomes instead of counting
+        stats = self.stats
+        stats.total_wallets_processed += 1
+        stats.total_processing_time_ms += processing_time_ms
         
         if success:
-            self.stats['successful_wallets'] += 1
+            stats.successful_wallets += 1
         else:
-            self.stats['failed_wallets'] += 1
+            stats.failed_wallets += 1
         
-        self.stats['last_processed_wallet'] = wallet_address
+        stats.last_processed_wallet = wallet_address
     
-    def get_stats(self) -> Dict[str, Any]:
-        """Get current processing statistics."""
-        uptime_seconds = int(time.time() - self.stats['start_time'])
-        
-        stats = self.stats.copy()
-        stats['uptime_seconds'] = uptime_seconds
+    def get_stats(self) -> ProcessingStats:
+        """Get current processing statistics, with the derived fields refreshed."""
+        stats = self.stats
+        stats.uptime_seconds = int(time.time() - stats.start_time)
         
-        if stats['total_wallets_processed'] > 0:
-            stats['average_processing_time_ms'] = (
-                stats['total_processing_time_ms'] / stats['total_wallets_processed']
+        if stats.total_wallets_processed > 0:
+            stats.average_processing_time_ms = (
+                stats.total_processing_time_ms / stats.total_wallets_processed
             )
         else:
-            stats['average_processing_time_ms'] = 0.0
+            stats.average_processing_time_ms = 0.0
         
         return stats
     
-    def get_health_status(self) -> str:
+    async def get_health_status(self) -> str:
         """Get Kafka health status."""
         try:
-            # Check if consumer and producer are working
-            if self.consumer and self.producer:
-                # Try to get metadata to verify connection
-                self.producer.metrics()
+            # Check if consumer and scoring workers (when consuming) and producer are working
+            if (not self.consume or (self.consumer and self.executor)) and self.producer:
+                # Try to get metadata to verify connection (blocking, so in thread pool)
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(
+                    None, lambda: self.producer.list_topics(self.success_topic, timeout=5)
+                )
                 return "healthy"
             else:
                 return "unhealthy"
@@ -306,14 +482,65 @@ class KafkaService:
         self.logger.info("Shutting down Kafka service")
         
         try:
-            if self.consumer:
-                self.consumer.close()
-                self.logger.info("Kafka consumer closed")
+            if self.executor:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+                self.logger.info("Scoring workers stopped")
             
             if self.producer:
-                self.producer.flush(timeout=10)
-                self.producer.close()
-                self.logger.info("Kafka producer closed")
+                # Deliver everything still queued
+                remaining = self.producer.flush(10)
+                self.producer = None
+                self.logger.info("Kafka producer closed", undelivered=remaining)
+            
+            if self.consumer:
+                # Commit and close on the consumer thread, after any in-flight consume call
+                await asyncio.get_running_loop().run_in_executor(self._consumer_executor, self._close_consumer)
+                self.consumer = None
+                self._consumer_executor.shutdown(wait=False)
+                self.logger.info("Kafka consumer closed")
                 
         except Exception as e:
-            self.logger.error("Error during shutdown", error=str(e)) 
\ No newline at end of file
+            self.logger.error("Error during shutdown", error=str(e))
+    
+    def _commit_batch(self):
+        """Asynchronously commit the offsets stored for the processed batch."""
+        try:
+            self.consumer.commit(asynchronous=True)
+        except KafkaException as e:
+            # Batch held only error events, nothing to commit
+            if e.args[0].code() != KafkaError._NO_OFFSET:
+                self.logger.error("Failed to commit offsets", error=str(e))
+    
+    def _rewind_batch(self, messages: List[Message], stored: Dict[Tuple[str, int], int]):
+        """Seek each partition of a failed batch back to its first message without a queued result."""
+        positions: Dict[Tuple[str, int], int] = {}
+        for message in messages:
+            if message.error():
+                continue
+            key = message.topic(), message.partition()
+            # Results are queued in batch order, so the unqueued messages of a partition are a suffix
+            if key not in positions and message.offset() >= stored.get(key, -1):
+                positions[key] = message.offset()
+        
+        for (topic, partition), offset in positions.items():
+            self.consumer.seek(TopicPartition(topic, partition, offset))
+        
+        if positions:
+            self.logger.warning("Rewound failed batch for redelivery", 
+                              partitions=len(positions))
+    
+    def _close_consumer(self):
+        """Synchronously commit the offsets stored for processed messages and close the consumer."""
+        try:
+            self.consumer.commit(asynchronous=False)
+        except KafkaException as e:
+            # Nothing consumed since the last commit
+            if e.args[0].code() != KafkaError._NO_OFFSET:
+                self.logger.error("Failed to commit offsets", error=str(e))
+        self.consumer.close()
+    
+    def _on_commit(self, err, partitions):
+        """Offset commit callback, served by consumer.consume()."""
+        if err is not None and err.code() != KafkaError._NO_OFFSET:
+            self.logger.error("Failed to commit offsets", error=str(err)) 
\ No newline at end of file
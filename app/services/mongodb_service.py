@@ -1,6 +1,5 @@
-import asyncio
-from typing import Optional, Dict, Any, List
-from pymongo import MongoClient
+from typing import Optional, Dict, Any, List, Mapping
+from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 import structlog
 
@@ -13,7 +12,7 @@ class MongoDBService:
     Provides async interface for database operations.
     """
     
-    def __init__(self, config: Dict[str, str]):
+    def __init__(self, config: Mapping[str, Any]):
         self.config = config
         self.logger = logger
         
@@ -23,27 +22,21 @@ class MongoDBService:
         self.tokens_collection = config.get('MONGODB_TOKENS_COLLECTION', 'tokens')
         self.thresholds_collection = config.get('MONGODB_THRESHOLDS_COLLECTION', 'protocol-thresholds-percentiles')
         
-        # MongoDB client
-        self.client: Optional[MongoClient] = None
-        self.database = None
-        
-        # Initialize connection
-        self._init_connection()
+        # MongoDB client (asyncio native, no thread pool hop per query)
+        self.client: Optional[AsyncIOMotorClient] = AsyncIOMotorClient(
+            self.mongodb_url,
+            maxPoolSize=50,
+            serverSelectionTimeoutMS=5000,  # 5 second timeout
+            connectTimeoutMS=5000,
+            socketTimeoutMS=5000
+        )
+        self.database = self.client[self.database_name]
     
-    def _init_connection(self):
-        """Initialize MongoDB connection."""
+    async def connect(self):
+        """Verify the MongoDB connection."""
         try:
-            self.client = MongoClient(
-                self.mongodb_url,
-                serverSelectionTimeoutMS=5000,  # 5 second timeout
-                connectTimeoutMS=5000,
-                socketTimeoutMS=5000
-            )
-            
             # Test connection
-            self.client.admin.command('ping')
-            
-            self.database = self.client[self.database_name]
+            await self.client.admin.command('ping')
             
             self.logger.info("MongoDB connection established", 
                            database=self.database_name,
@@ -56,12 +49,12 @@ class MongoDBService:
             self.logger.error("MongoDB initialization error", error=str(e))
             raise
     
-    def get_health_status(self) -> str:
+    async def get_health_status(self) -> str:
         """Get MongoDB health status."""
         try:
             if self.client:
                 # Ping the database
-                self.client.admin.command('ping')
+                await self.client.admin.command('ping')
                 return "healthy"
             else:
                 return "unhealthy"
@@ -79,13 +72,8 @@ class MongoDBService:
             Token information dictionary or None if not found
         """
         try:
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.database[self.tokens_collection].find_one(
-                    {"address": token_address}
-                )
+            result = await self.database[self.tokens_collection].find_one(
+                {"address": token_address}
             )
             
             return result
@@ -107,13 +95,8 @@ class MongoDBService:
             Protocol thresholds dictionary or None if not found
         """
         try:
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.database[self.thresholds_collection].find_one(
-                    {"protocol_type": protocol_type}
-                )
+            result = await self.database[self.thresholds_collection].find_one(
+                {"protocol_type": protocol_type}
             )
             
             return result
@@ -136,15 +119,10 @@ class MongoDBService:
             True if successful, False otherwise
         """
         try:
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.database[self.tokens_collection].update_one(
-                    {"address": token_address},
-                    {"$set": token_data},
-                    upsert=True
-                )
+            result = await self.database[self.tokens_collection].update_one(
+                {"address": token_address},
+                {"$set": token_data},
+                upsert=True
             )
             
             self.logger.info("Token info updated", 
@@ -172,15 +150,10 @@ class MongoDBService:
             True if successful, False otherwise
         """
         try:
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.database[self.thresholds_collection].update_one(
-                    {"protocol_type": protocol_type},
-                    {"$set": thresholds},
-                    upsert=True
-                )
+            result = await self.database[self.thresholds_collection].update_one(
+                {"protocol_type": protocol_type},
+                {"$set": thresholds},
+                upsert=True
             )
             
             self.logger.info("Protocol thresholds updated", 
@@ -204,15 +177,9 @@ class MongoDBService:
             List of token dictionaries
         """
         try:
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            cursor = await loop.run_in_executor(
-                None,
-                lambda: self.database[self.tokens_collection].find({})
-            )
-            
-            # Convert cursor to list
-            tokens = await loop.run_in_executor(None, lambda: list(cursor))
+            # Stream the cursor instead of loading it in one blocking call
+            cursor = self.database[self.tokens_collection].find({})
+            tokens = [token async for token in cursor]
             
             return tokens
             
@@ -228,15 +195,9 @@ class MongoDBService:
             List of protocol dictionaries
         """
         try:
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            cursor = await loop.run_in_executor(
-                None,
-                lambda: self.database[self.thresholds_collection].find({})
-            )
-            
-            # Convert cursor to list
-            protocols = await loop.run_in_executor(None, lambda: list(cursor))
+            # Stream the cursor instead of loading it in one blocking call
+            cursor = self.database[self.thresholds_collection].find({})
+            protocols = [protocol async for protocol in cursor]
             
             return protocols
             
@@ -248,16 +209,10 @@ class MongoDBService:
         """Create database indexes for better performance."""
         try:
             # Create indexes for tokens collection
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.database[self.tokens_collection].create_index("address", unique=True)
-            )
+            await self.database[self.tokens_collection].create_index("address", unique=True)
             
             # Create indexes for thresholds collection
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.database[self.thresholds_collection].create_index("protocol_type", unique=True)
-            )
+            await self.database[self.thresholds_collection].create_index("protocol_type", unique=True)
             
             self.logger.info("Database indexes created successfully")
             
@@ -1,5 +1,7 @@
 import os
-from typing import Dict, Any
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Mapping
 from dotenv import load_dotenv
 import structlog
 
@@ -28,6 +30,8 @@ class Config:
         self.KAFKA_SUCCESS_TOPIC = os.getenv('KAFKA_SUCCESS_TOPIC', 'wallet-scores-success')
         self.KAFKA_FAILURE_TOPIC = os.getenv('KAFKA_FAILURE_TOPIC', 'wallet-scores-failure')
         self.KAFKA_CONSUMER_GROUP = os.getenv('KAFKA_CONSUMER_GROUP', 'ai-scoring-service')
+        # Set to false when the consumer runs as its own process (python -m app.consumer)
+        self.RUN_KAFKA_CONSUMER = os.getenv('RUN_KAFKA_CONSUMER', 'true').lower() == 'true'
         
         # MongoDB configuration
         self.MONGODB_URL = os.getenv('MONGODB_URL', 'mongodb://localhost:27017')
@@ -42,7 +46,7 @@ class Config:
         
         # Performance configuration
         self.MAX_WORKERS = int(os.getenv('MAX_WORKERS', '4'))
-        self.BATCH_SIZE = int(os.getenv('BATCH_SIZE', '10'))
+        self.BATCH_SIZE = int(os.getenv('BATCH_SIZE', '64'))
         self.PROCESSING_TIMEOUT_MS = int(os.getenv('PROCESSING_TIMEOUT_MS', '5000'))
         
         # Logging configuration
@@ -75,35 +79,41 @@ class Config:
         if missing_vars:
             raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
     
-    def get_kafka_config(self) -> Dict[str, str]:
-        """Get Kafka configuration as dictionary."""
-        return {
+    @cached_property
+    def kafka_config(self) -> Mapping[str, Any]:
+        """Kafka configuration as a read-only mapping, built once."""
+        return MappingProxyType({
             'KAFKA_BOOTSTRAP_SERVERS': self.KAFKA_BOOTSTRAP_SERVERS,
             'KAFKA_INPUT_TOPIC': self.KAFKA_INPUT_TOPIC,
             'KAFKA_SUCCESS_TOPIC': self.KAFKA_SUCCESS_TOPIC,
             'KAFKA_FAILURE_TOPIC': self.KAFKA_FAILURE_TOPIC,
-            'KAFKA_CONSUMER_GROUP': self.KAFKA_CONSUMER_GROUP
-        }
+            'KAFKA_CONSUMER_GROUP': self.KAFKA_CONSUMER_GROUP,
+            'RUN_KAFKA_CONSUMER': self.RUN_KAFKA_CONSUMER,
+            'BATCH_SIZE': self.BATCH_SIZE,
+            'MAX_WORKERS': self.MAX_WORKERS
+        })
     
-    def get_mongodb_config(self) -> Dict[str, str]:
-        """Get MongoDB configuration as dictionary."""
-        return {
+    @cached_property
+    def mongodb_config(self) -> Mapping[str, Any]:
+        """MongoDB configuration as a read-only mapping, built once."""
+        return MappingProxyType({
             'MONGODB_URL': self.MONGODB_URL,
             'MONGODB_DATABASE': self.MONGODB_DATABASE,
             'MONGODB_TOKENS_COLLECTION': self.MONGODB_TOKENS_COLLECTION,
             'MONGODB_THRESHOLDS_COLLECTION': self.MONGODB_THRESHOLDS_COLLECTION
-        }
+        })
     
-    def get_server_config(self) -> Dict[str, Any]:
-        """Get server configuration as dictionary."""
-        return {
+    @cached_property
+    def server_config(self) -> Mapping[str, Any]:
+        """Server configuration as a read-only mapping, built once."""
+        return MappingProxyType({
             'HOST': self.HOST,
             'PORT': self.PORT,
             'LOG_LEVEL': self.LOG_LEVEL,
             'ENVIRONMENT': self.ENVIRONMENT,
             'VERSION': self.VERSION,
             'APP_NAME': self.APP_NAME
-        }
+        })
     
     def is_production(self) -> bool:
         """Check if running in production environment."""
@@ -113,16 +123,17 @@ class Config:
         """Check if running in development environment."""
         return self.ENVIRONMENT.lower() == 'development'
     
-    def get_all_config(self) -> Dict[str, Any]:
-        """Get all configuration as dictionary."""
-        return {
-            **self.get_kafka_config(),
-            **self.get_mongodb_config(),
-            **self.get_server_config(),
+    @cached_property
+    def all_config(self) -> Mapping[str, Any]:
+        """All configuration as a read-only mapping, built once."""
+        return MappingProxyType({
+            **self.kafka_config,
+            **self.mongodb_config,
+            **self.server_config,
             'MAX_WORKERS': self.MAX_WORKERS,
             'BATCH_SIZE': self.BATCH_SIZE,
             'PROCESSING_TIMEOUT_MS': self.PROCESSING_TIMEOUT_MS
-        }
+        })
     
     def __str__(self) -> str:
         """String representation of configuration."""
@@ -0,0 +1,39 @@
+import logging
+
+import orjson
+import structlog
+
+from app.utils.config import config
+
+# Numeric log level from LOG_LEVEL, INFO for unknown names
+LOG_LEVEL = logging.getLevelNamesMapping().get(config.LOG_LEVEL.upper(), logging.INFO)
+
+
+class _NamedBytesLogger(structlog.BytesLogger):
+    """BytesLogger that keeps the name it was created with for add_logger_name."""
+    
+    __slots__ = ('name',)
+    
+    def __init__(self, name: str = None):
+        super().__init__()
+        self.name = name
+
+
+def configure_logging():
+    """Configure structured JSON logging for the application processes."""
+    structlog.configure(
+        processors=[
+            structlog.stdlib.add_logger_name,
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            structlog.processors.JSONRenderer(serializer=orjson.dumps)
+        ],
+        context_class=dict,
+        # Rendered bytes go straight to stdout, filtered calls are no-ops
+        logger_factory=_NamedBytesLogger,
+        wrapper_class=structlog.make_filtering_bound_logger(LOG_LEVEL),
+        cache_logger_on_first_use=True,
+    )
\ No newline at end of file
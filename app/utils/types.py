@@ -1,12 +1,21 @@
 from typing import List, Optional, Union, Dict, Any
-from pydantic import BaseModel, Field, validator
-from decimal import Decimal
+from pydantic import BaseModel, Field, field_validator
+from functools import lru_cache
+import re
+import sys
 import time
 
+# Interned protocol type for DEX data; ProtocolData interns protocolType so most comparisons are pointer-equal
+DEX_PROTOCOL_TYPE = sys.intern('dexes')
+
+_VALID_ACTIONS = frozenset({'swap', 'deposit', 'withdraw', 'add_liquidity', 'remove_liquidity'})
+_WALLET_ADDRESS_RE = re.compile(r'0x[0-9a-fA-F]{40}')
+_DECIMAL_RE = re.compile(r'[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?')
+
 
 class TokenInfo(BaseModel):
     amount: int
-    amountUSD: float
+    amountUSD: float = Field(allow_inf_nan=False)  # NaN or inf would top out every volume ladder
     address: str
     symbol: str
 
@@ -24,11 +33,11 @@ class Transaction(BaseModel):
     token0: Optional[TokenInfo] = None
     token1: Optional[TokenInfo] = None
 
-    @validator('action')
+    @field_validator('action')
+    @classmethod
     def validate_action(cls, v):
-        valid_actions = ['swap', 'deposit', 'withdraw', 'add_liquidity', 'remove_liquidity']
-        if v not in valid_actions:
-            raise ValueError(f'Invalid action: {v}. Must be one of {valid_actions}')
+        if v not in _VALID_ACTIONS:
+            raise ValueError(f'Invalid action: {v}. Must be one of {sorted(_VALID_ACTIONS)}')
         return v
 
 
@@ -36,14 +45,20 @@ class ProtocolData(BaseModel):
     protocolType: str
     transactions: List[Transaction]
 
+    @field_validator('protocolType')
+    @classmethod
+    def normalize_protocol_type(cls, v):
+        return sys.intern(v.lower())
+
 
 class WalletTransactionInput(BaseModel):
     wallet_address: str
     data: List[ProtocolData]
 
-    @validator('wallet_address')
+    @field_validator('wallet_address')
+    @classmethod
     def validate_wallet_address(cls, v):
-        if not v.startswith('0x') or len(v) != 42:
+        if not _WALLET_ADDRESS_RE.fullmatch(v):
             raise ValueError('Invalid wallet address format')
         return v
 
@@ -68,6 +83,13 @@ class CategoryScore(BaseModel):
     features: CategoryFeatures
 
 
+@lru_cache(maxsize=65536)
+def format_zscore(score: float) -> str:
+    """Format an overall score as a zscore string with 18 decimal places."""
+    # Overall scores are means of 2-decimal category scores, so values repeat often
+    return f"{score:.18f}"
+
+
 class WalletScoreSuccess(BaseModel):
     wallet_address: str
     zscore: str
@@ -75,11 +97,10 @@ class WalletScoreSuccess(BaseModel):
     processing_time_ms: int
     categories: List[CategoryScore]
 
-    @validator('zscore')
+    @field_validator('zscore')
+    @classmethod
     def validate_zscore(cls, v):
-        try:
-            Decimal(v)
-        except:
+        if not _DECIMAL_RE.fullmatch(v):
             raise ValueError('zscore must be a valid decimal string')
         return v
 
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the AI Scoring Server hot path.
+
+Times each stage of handling one wallet in isolation (JSON parsing, input
+validation, scoring and result encoding) so a regression can be traced to
+a single stage instead of the end-to-end HTTP timing in test_challenge.py.
+
+Usage: python benchmark.py [--transactions N] [--number N]
+"""
+
+import argparse
+import json
+import timeit
+from typing import Callable, Dict, Any
+
+import orjson
+
+from app.models.dex_model import DEXScoringModel
+from app.utils.types import WalletTransactionInput, WalletScoreSuccess, format_zscore
+
+WALLET_FILE = "test_wallet.json"
+
+
+def build_payload(num_transactions: int) -> Dict[str, Any]:
+    """Scale the sample wallet up to num_transactions DEX transactions."""
+    with open(WALLET_FILE) as f:
+        wallet = json.load(f)
+        
+    for protocol_data in wallet['data']:
+        if protocol_data['protocolType'] == 'dexes':
+            sample = protocol_data['transactions']
+            protocol_data['transactions'] = [
+                {**sample[i % len(sample)], 'document_id': f"{i:024x}", 'timestamp': sample[i % len(sample)]['timestamp'] + i}
+                for i in range(num_transactions)
+            ]
+            
+    return wallet
+
+
+def bench(name: str, func: Callable[[], Any], number: int):
+    """Print the best per-call time of func over five runs."""
+    best = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {name:<40} {best * 1e6:>10.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI Scoring Server micro-benchmarks")
+    parser.add_argument("--transactions", type=int, default=200, help="DEX transactions per wallet")
+    parser.add_argument("--number", type=int, default=200, help="calls per timing run")
+    args = parser.parse_args()
+    
+    payload = build_payload(args.transactions)
+    body = orjson.dumps(payload)
+    data = orjson.loads(body)
+    wallet_input = WalletTransactionInput.model_validate(data)
+    model = DEXScoringModel()
+    category_scores, overall_score = model.process_wallet_data(wallet_input.data)
+    success = WalletScoreSuccess(
+        wallet_address=wallet_input.wallet_address,
+        zscore=format_zscore(overall_score),
+        timestamp=0,
+        processing_time_ms=0,
+        categories=category_scores
+    )
+    success_json = success.model_dump_json()
+    
+    print(f"Wallet with {args.transactions} DEX transactions ({len(body)} bytes)")
+    bench("json.loads", lambda: json.loads(body), args.number)
+    bench("orjson.loads", lambda: orjson.loads(body), args.number)
+    bench("WalletTransactionInput(**data)", lambda: WalletTransactionInput(**data), args.number)
+    bench("WalletTransactionInput.model_validate", lambda: WalletTransactionInput.model_validate(data), args.number)
+    bench("WalletTransactionInput.model_validate_json", lambda: WalletTransactionInput.model_validate_json(body), args.number)
+    bench("DEXScoringModel.process_wallet_data", lambda: model.process_wallet_data(wallet_input.data), args.number)
+    bench("WalletScoreSuccess.model_validate_json", lambda: WalletScoreSuccess.model_validate_json(success_json), args.number)
+    bench("WalletScoreSuccess.model_dump_json", success.model_dump_json, args.number)
+
+
+if __name__ == "__main__":
+    main()
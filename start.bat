@@ -83,7 +83,7 @@ echo ======================================
 echo 📊 AI Scoring Server: http://localhost:8000
 echo 📈 API Documentation: http://localhost:8000/docs
 echo 🔍 Health Check: http://localhost:8000/api/v1/health
-echo 📊 Statistics: http://localhost:8000/api/v1/stats
+echo 📊 Statistics: http://localhost:8000/api/v1/stats (in-process consumer only)
 echo.
 echo 📋 Kafka Topics:
 echo    - Input: wallet-transactions
@@ -5,18 +5,27 @@ This script validates the core functionality and performance requirements.
 """
 
 import json
+import logging
 import time
 import requests
+from requests.adapters import HTTPAdapter
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import numpy as np
 from typing import Dict, Any, List
 import structlog
 
 # Configure logging
-structlog.configure(processors=[structlog.processors.JSONRenderer()])
+structlog.configure(
+    processors=[structlog.processors.JSONRenderer()],
+    wrapper_class=structlog.make_filtering_bound_logger(logging.INFO)
+)
 logger = structlog.get_logger(__name__)
 
 # Test configuration
 SERVER_URL = "http://localhost:8000"
+PERFORMANCE_CONCURRENCY = 64  # max in-flight requests in the performance test
 TEST_WALLET_DATA = {
     "wallet_address": "0x742d35Cc6634C0532925a3b8D4C9db96590e4265",
     "data": [
@@ -70,6 +79,39 @@ TEST_WALLET_DATA = {
     ]
 }
 
+# DEX wallet with negative USD amounts: deposit -1 and withdraw -10, held over a year.
+# The retention bonus goes to -900, for a combined score of -365 outside the [0, 1000] table
+NEGATIVE_AMOUNT_WALLET = {
+    "wallet_address": "0x742d35Cc6634C0532925a3b8D4C9db96590e4265",
+    "data": [
+        {
+            "protocolType": "dexes",
+            "transactions": [
+                {
+                    "document_id": f"negative_{action}",
+                    "action": action,
+                    "timestamp": int(time.time()) - 400 * 86400,
+                    "caller": "0x742d35Cc6634C0532925a3b8D4C9db96590e4265",
+                    "protocol": "uniswap_v3",
+                    "poolId": "0x88e6a0c2ddd26feeb64f039a2c41296fcb3f5640",
+                    "poolName": "Uniswap V3 USDC/WETH 0.05%",
+                    "token0": {
+                        "amount": int(amount_usd * 1_000_000),
+                        "amountUSD": amount_usd,
+                        "address": "0xa0b86a33e6c3d4c3e6c3d4c3e6c3d4c3e6c3d4c3",
+                        "symbol": "USDC"
+                    }
+                }
+                for action, amount_usd in (("deposit", -1.0), ("withdraw", -10.0))
+            ]
+        }
+    ]
+}
+NEGATIVE_AMOUNT_DEX_SCORE = round(1000 / (1 + np.exp(-(-365 - 500) / 200)), 2)  # 13.06
+
+# Stand-in for the per-request wallet address in pre-encoded load test bodies
+WALLET_ADDRESS_PLACEHOLDER = "__WALLET_ADDRESS__"
+
 # Additional test wallets for load testing
 TEST_WALLETS = [
     {
@@ -144,6 +186,12 @@ class ChallengeTester:
         self.server_url = server_url
         self.test_results = []
         self.start_time = time.time()
+        
+        # One session for all sequential tests so the TCP connection is reused
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
     def log_test(self, test_name: str, success: bool, details: str = "", duration: float = 0):
         """Log test results."""
@@ -157,16 +205,14 @@ class ChallengeTester:
         self.test_results.append(result)
         
         status = "✅ PASS" if success else "❌ FAIL"
-        logger.info(f"{status} {test_name}", **result)
-        
-        if not success and details:
-            logger.error(f"Test failed: {details}")
+        log = logger.info if success else logger.error
+        log("Test result", status=status, **result)
     
     def test_server_startup(self) -> bool:
         """Test if the server is running and responding."""
         try:
             start_time = time.time()
-            response = requests.get(f"{self.server_url}/", timeout=10)
+            response = self.session.get(f"{self.server_url}/", timeout=10)
             duration = time.time() - start_time
             
             if response.status_code == 200:
@@ -185,7 +231,7 @@ class ChallengeTester:
         """Test the health check endpoint."""
         try:
             start_time = time.time()
-            response = requests.get(f"{self.server_url}/api/v1/health", timeout=10)
+            response = self.session.get(f"{self.server_url}/api/v1/health", timeout=10)
             duration = time.time() - start_time
             
             if response.status_code == 200:
@@ -205,13 +251,17 @@ class ChallengeTester:
         """Test the statistics endpoint."""
         try:
             start_time = time.time()
-            response = requests.get(f"{self.server_url}/api/v1/stats", timeout=10)
+            response = self.session.get(f"{self.server_url}/api/v1/stats", timeout=10)
             duration = time.time() - start_time
             
             if response.status_code == 200:
                 data = response.json()
                 self.log_test("Stats Endpoint", True, f"Stats retrieved: {data.get('total_wallets_processed', 0)} wallets", duration)
                 return True
+            elif response.status_code == 503 and "out of process" in response.text:
+                # Split deployment: the consumer process logs its statistics instead
+                self.log_test("Stats Endpoint", True, "Kafka consumer runs out of process, statistics are logged by the consumer", duration)
+                return True
             else:
                 self.log_test("Stats Endpoint", False, f"HTTP {response.status_code}: {response.text}", duration)
                 return False
@@ -224,7 +274,7 @@ class ChallengeTester:
         """Test wallet processing functionality."""
         try:
             start_time = time.time()
-            response = requests.post(
+            response = self.session.post(
                 f"{self.server_url}/api/v1/process-wallet",
                 json=wallet_data,
                 timeout=30
@@ -261,7 +311,7 @@ class ChallengeTester:
         
         try:
             start_time = time.time()
-            response = requests.post(
+            response = self.session.post(
                 f"{self.server_url}/api/v1/process-wallet",
                 json=invalid_wallet,
                 timeout=10
@@ -280,40 +330,84 @@ class ChallengeTester:
             self.log_test("Data Validation", False, f"Request failed: {str(e)}", 0)
             return False
     
+    def test_negative_amounts(self) -> bool:
+        """Test that scores outside the normalization table still follow the exact sigmoid."""
+        try:
+            start_time = time.time()
+            response = self.session.post(
+                f"{self.server_url}/api/v1/process-wallet",
+                json=NEGATIVE_AMOUNT_WALLET,
+                timeout=30
+            )
+            duration = time.time() - start_time
+            
+            if response.status_code != 200:
+                self.log_test("Negative Amounts", False, f"HTTP {response.status_code}: {response.text}", duration)
+                return False
+            
+            score = response.json()['categories'][0]['score']
+            if score == NEGATIVE_AMOUNT_DEX_SCORE:
+                self.log_test("Negative Amounts", True, f"DEX score={score}", duration)
+                return True
+            else:
+                self.log_test("Negative Amounts", False, f"Expected DEX score {NEGATIVE_AMOUNT_DEX_SCORE}, got {score}", duration)
+                return False
+                
+        except requests.exceptions.RequestException as e:
+            self.log_test("Negative Amounts", False, f"Request failed: {str(e)}", 0)
+            return False
+    
+    async def _post_wallets(self, bodies: List[bytes], concurrency: int = PERFORMANCE_CONCURRENCY) -> List[Any]:
+        """Post JSON wallet bodies with at most `concurrency` in flight; returns (status_code, duration) or the exception per wallet."""
+        concurrency = max(min(concurrency, len(bodies)), 1)
+        # Keep-alive pool sized to the in-flight cap, so connections are reused across wallets
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency, keepalive_expiry=60)
+        in_flight = asyncio.Semaphore(concurrency)
+        headers = {"content-type": "application/json"}
+        
+        async with httpx.AsyncClient(base_url=self.server_url, timeout=30, limits=limits) as client:
+            async def post_wallet(body: bytes):
+                async with in_flight:
+                    wallet_start = time.time()
+                    response = await client.post("/api/v1/process-wallet", content=body, headers=headers)
+                    return response.status_code, time.time() - wallet_start
+            
+            return await asyncio.gather(*(post_wallet(body) for body in bodies), return_exceptions=True)
+    
     def test_performance(self, num_wallets: int = 10) -> bool:
-        """Test performance with multiple wallets."""
-        logger.info(f"Starting performance test with {num_wallets} wallets")
+        """Test performance with multiple wallets sent concurrently."""
+        logger.info("Starting performance test", num_wallets=num_wallets)
+        
+        # Encode each test wallet once, then only splice in a unique address per request
+        templates = [
+            json.dumps({**wallet, 'wallet_address': WALLET_ADDRESS_PLACEHOLDER}).encode()
+            for wallet in TEST_WALLETS
+        ]
+        bodies = [
+            templates[i % len(templates)].replace(WALLET_ADDRESS_PLACEHOLDER.encode(), f"0x{i:040x}".encode(), 1)
+            for i in range(num_wallets)
+        ]
         
         start_time = time.time()
-        successful_wallets = 0
-        total_processing_time = 0
+        results = asyncio.run(self._post_wallets(bodies))
+        total_duration = time.time() - start_time
+        
+        # Per-wallet durations, NaN for failed wallets
+        durations = np.full(num_wallets, np.nan)
         
-        for i in range(num_wallets):
-            # Use test wallet data with unique addresses
-            test_wallet = TEST_WALLETS[i % len(TEST_WALLETS)].copy()
-            test_wallet['wallet_address'] = f"0x{i:040x}"
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                logger.warning("Wallet failed", wallet=i, error=str(result))
+                continue
             
-            try:
-                wallet_start = time.time()
-                response = requests.post(
-                    f"{self.server_url}/api/v1/process-wallet",
-                    json=test_wallet,
-                    timeout=30
-                )
-                wallet_duration = time.time() - wallet_start
-                
-                if response.status_code == 200:
-                    successful_wallets += 1
-                    total_processing_time += wallet_duration
-                
-                # Small delay between requests
-                time.sleep(0.1)
-                
-            except Exception as e:
-                logger.warning(f"Wallet {i} failed: {str(e)}")
+            status_code, wallet_duration = result
+            if status_code == 200:
+                durations[i] = wallet_duration
         
-        total_duration = time.time() - start_time
-        avg_processing_time = total_processing_time / successful_wallets if successful_wallets > 0 else 0
+        successful = ~np.isnan(durations)
+        successful_wallets = int(np.count_nonzero(successful))
+        avg_processing_time = float(durations[successful].mean()) if successful_wallets > 0 else 0
+        p95_processing_time = float(np.percentile(durations[successful], 95)) if successful_wallets > 0 else 0
         
         # Performance requirements: <2 seconds average, 1000+ wallets/minute
         performance_ok = avg_processing_time < 2.0 and (successful_wallets / total_duration * 60) >= 1
@@ -321,7 +415,8 @@ class ChallengeTester:
         self.log_test(
             "Performance Test",
             performance_ok,
-            f"Processed {successful_wallets}/{num_wallets} wallets in {total_duration:.2f}s, avg: {avg_processing_time:.2f}s",
+            f"Processed {successful_wallets}/{num_wallets} wallets in {total_duration:.2f}s, "
+            f"avg: {avg_processing_time:.2f}s, p95: {p95_processing_time:.2f}s",
             total_duration
         )
         
@@ -331,7 +426,7 @@ class ChallengeTester:
         """Test configuration endpoint (development only)."""
         try:
             start_time = time.time()
-            response = requests.get(f"{self.server_url}/api/v1/config", timeout=10)
+            response = self.session.get(f"{self.server_url}/api/v1/config", timeout=10)
             duration = time.time() - start_time
             
             if response.status_code == 200:
@@ -354,21 +449,25 @@ class ChallengeTester:
         """Run all test cases and return results."""
         logger.info("Starting AI Scoring Server challenge tests")
         
-        # Basic functionality tests
+        # Server must be up before anything else runs
         self.test_server_startup()
-        self.test_health_endpoint()
-        self.test_stats_endpoint()
         
-        # Core functionality tests
-        self.test_wallet_processing(TEST_WALLET_DATA)
-        self.test_data_validation()
+        # Independent endpoint and functionality tests run concurrently
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            futures = [
+                executor.submit(self.test_health_endpoint),
+                executor.submit(self.test_stats_endpoint),
+                executor.submit(self.test_wallet_processing, TEST_WALLET_DATA),
+                executor.submit(self.test_data_validation),
+                executor.submit(self.test_negative_amounts),
+                executor.submit(self.test_config_endpoint)
+            ]
+            for future in futures:
+                future.result()
         
-        # Performance tests
+        # Performance tests last, so they do not skew the timings above
         self.test_performance(20)  # Test with 20 wallets
         
-        # Configuration tests
-        self.test_config_endpoint()
-        
         # Calculate overall results
         total_tests = len(self.test_results)
         passed_tests = sum(1 for result in self.test_results if result['success'])